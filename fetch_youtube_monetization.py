@@ -7,9 +7,18 @@ Fetches revenue metrics and stores them in JSON format for dashboard display
 from datetime import datetime, timedelta
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
-import json
-import pickle
+import aiohttp
+import asyncio
+import functools
+import mmap
+import orjson
 import os
+import time
+
+try:
+    import uvloop
+except ImportError:  # uvloop does not support Windows
+    uvloop = None
 
 # OAuth scopes - includes monetary scope for revenue data
 SCOPES = [
@@ -18,152 +27,263 @@ SCOPES = [
     'https://www.googleapis.com/auth/yt-analytics-monetary.readonly'
 ]
 
-def authenticate():
+# Authorized user credentials written by Credentials.to_json()
+TOKEN_FILE = 'token.json'
+
+# Dashboard data file, also read back for totals recorded by earlier runs
+OUTPUT_FILE = 'youtube_monetization.json'
+
+# Analytics endpoints reject too many concurrent connections from one caller
+MAX_CONCURRENT_REQUESTS = 5
+
+# Total size of the shared aiohttp connection pool
+CONNECTION_POOL_SIZE = 10
+
+# YouTube Data API accepts at most 50 video IDs per videos.list call
+MAX_VIDEO_IDS_PER_REQUEST = 50
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = (429, 500, 503)
+MAX_FETCH_ATTEMPTS = 3
+
+# How long API responses are reused when main() runs again in the same
+# process; analytics data only updates daily
+CACHE_TTL_SECONDS = 300
+CACHE_MAX_ENTRIES = 32
+
+# Cached API responses keyed by request URI: {uri: (fetched_at, response)}
+_response_cache = {}
+
+# Month abbreviations for chart labels, indexed by month number - 1
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+def load_credentials(token_file):
+    """
+    Load authorized user credentials from a token.json file
+    The file is memory-mapped and parsed as bytes by orjson
     """
-    Authenticate with YouTube Analytics API using token.pickle
+    with open(token_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as token:
+            with memoryview(token) as view:
+                info = orjson.loads(view)
+    
+    return Credentials.from_authorized_user_info(info, SCOPES)
+
+class YtClient:
+    """
+    YouTube API clients that authenticate on first use
     Handles token refresh automatically
     """
-    creds = None
     
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
+    def __init__(self, token_file=TOKEN_FILE):
+        self.token_file = token_file
     
-    # Check if credentials are expired and refresh if needed
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            from google.auth.transport.requests import Request
-            print("Token expired, refreshing...")
-            creds.refresh(Request())
-            
-            # Save the refreshed token
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
-            print("Token refreshed successfully")
-        else:
-            raise Exception("Invalid or missing credentials. Please regenerate token.pickle")
-    
-    youtube_analytics = build('youtubeAnalytics', 'v2', credentials=creds)
-    return youtube_analytics
+    @functools.cached_property
+    def creds(self):
+        """
+        Credentials from the token file, refreshed and saved if expired
+        """
+        creds = None
+        
+        # An empty token file holds no credentials, and cannot be memory-mapped
+        if os.path.exists(self.token_file) and os.path.getsize(self.token_file) > 0:
+            try:
+                creds = load_credentials(self.token_file)
+            except ValueError as e:
+                # Not authorized user JSON, e.g. an old token.pickle
+                raise Exception(f"Invalid or missing credentials. Please regenerate {self.token_file}") from e
+        
+        # Check if credentials are expired and refresh if needed
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                from google.auth.transport.requests import Request
+                print("Token expired, refreshing...")
+                creds.refresh(Request())
+                
+                # Save the refreshed token
+                with open(self.token_file, 'w') as token:
+                    token.write(creds.to_json())
+                print("Token refreshed successfully")
+            else:
+                raise Exception(f"Invalid or missing credentials. Please regenerate {self.token_file}")
+        
+        return creds
+    
+    @functools.cached_property
+    def analytics(self):
+        """
+        YouTube Analytics API client, built from the bundled discovery document
+        Only used to build request URIs; requests go through the aiohttp session
+        """
+        return build('youtubeAnalytics', 'v2', credentials=self.creds,
+                     static_discovery=True, cache_discovery=False)
+    
+    @functools.cached_property
+    def data(self):
+        """
+        YouTube Data API client, built from the bundled discovery document
+        Only used to build request URIs; requests go through the aiohttp session
+        """
+        return build('youtube', 'v3', credentials=self.creds,
+                     static_discovery=True, cache_discovery=False)
 
-def fetch_revenue_metrics(youtube_analytics, start_date, end_date):
+def safe_fetch(name, default=None):
     """
-    Fetch core revenue metrics for the specified date range
+    Wrap an async fetcher so errors are logged and default is returned
+    Retries rate limited and transient server errors with exponential backoff
     """
-    try:
-        response = youtube_analytics.reports().query(
-            ids='channel==MINE',
-            startDate=start_date.strftime('%Y-%m-%d'),
-            endDate=end_date.strftime('%Y-%m-%d'),
-            metrics='estimatedRevenue,cpm,monetizedPlaybacks,adImpressions',
-            currency='USD'
-        ).execute()
-        
-        return response
-    except Exception as e:
-        print(f"Error fetching revenue metrics: {e}")
-        return None
+    def decorator(fetch):
+        @functools.wraps(fetch)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(MAX_FETCH_ATTEMPTS):
+                try:
+                    return await fetch(*args, **kwargs)
+                except aiohttp.ClientResponseError as e:
+                    if e.status in RETRYABLE_STATUSES and attempt < MAX_FETCH_ATTEMPTS - 1:
+                        print(f"Retrying {name} after HTTP {e.status}...")
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+                    print(f"Error fetching {name}: {e}")
+                    return default
+                except Exception as e:
+                    print(f"Error fetching {name}: {e}")
+                    return default
+        return wrapper
+    return decorator
+
+async def execute_async(session, request):
+    """
+    Execute a googleapiclient request over the shared aiohttp session
+    The discovery client is only used to build the request URI
+    Identical requests within CACHE_TTL_SECONDS reuse the cached response
+    """
+    cached = _response_cache.get(request.uri)
+    if cached and time.monotonic() - cached[0] < CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    async with session.get(request.uri) as response:
+        response.raise_for_status()
+        result = await response.json()
+    
+    # Drop expired entries, then the oldest ones if the cache is still full;
+    # the dict stays in insertion order, which is also fetch order
+    now = time.monotonic()
+    _response_cache.pop(request.uri, None)
+    for uri in [uri for uri, (fetched_at, _) in _response_cache.items()
+                if now - fetched_at >= CACHE_TTL_SECONDS]:
+        del _response_cache[uri]
+    while len(_response_cache) >= CACHE_MAX_ENTRIES:
+        del _response_cache[next(iter(_response_cache))]
+    
+    _response_cache[request.uri] = (now, result)
+    return result
+
+@safe_fetch('revenue metrics')
+async def fetch_revenue_metrics(session, youtube_analytics, start_date_str, end_date_str):
+    """
+    Fetch core revenue metrics and total views for the specified date range
+    """
+    response = await execute_async(session, youtube_analytics.reports().query(
+        ids='channel==MINE',
+        startDate=start_date_str,
+        endDate=end_date_str,
+        metrics='estimatedRevenue,cpm,monetizedPlaybacks,adImpressions,views',
+        currency='USD',
+        fields='rows'
+    ))
+    
+    return response
 
-def fetch_daily_revenue(youtube_analytics, start_date, end_date):
+@safe_fetch('daily revenue')
+async def fetch_daily_revenue(session, youtube_analytics, start_date_str, end_date_str):
     """
     Fetch daily revenue data for trend chart
     """
-    try:
-        response = youtube_analytics.reports().query(
-            ids='channel==MINE',
-            startDate=start_date.strftime('%Y-%m-%d'),
-            endDate=end_date.strftime('%Y-%m-%d'),
-            metrics='estimatedRevenue',
-            dimensions='day',
-            sort='day',
-            currency='USD'
-        ).execute()
-        
-        return response
-    except Exception as e:
-        print(f"Error fetching daily revenue: {e}")
-        return None
+    response = await execute_async(session, youtube_analytics.reports().query(
+        ids='channel==MINE',
+        startDate=start_date_str,
+        endDate=end_date_str,
+        metrics='estimatedRevenue',
+        dimensions='day',
+        sort='day',
+        currency='USD',
+        fields='rows'
+    ))
+    
+    return response
 
-def fetch_revenue_by_ad_type(youtube_analytics, start_date, end_date):
+@safe_fetch('ad type revenue')
+async def fetch_revenue_by_ad_type(session, youtube_analytics, start_date_str, end_date_str):
     """
     Fetch revenue breakdown by ad type
     """
-    try:
-        response = youtube_analytics.reports().query(
-            ids='channel==MINE',
-            startDate=start_date.strftime('%Y-%m-%d'),
-            endDate=end_date.strftime('%Y-%m-%d'),
-            metrics='estimatedRevenue',
-            dimensions='adType',
-            sort='-estimatedRevenue',
-            currency='USD'
-        ).execute()
-        
-        return response
-    except Exception as e:
-        print(f"Error fetching ad type revenue: {e}")
-        return None
+    response = await execute_async(session, youtube_analytics.reports().query(
+        ids='channel==MINE',
+        startDate=start_date_str,
+        endDate=end_date_str,
+        metrics='estimatedRevenue',
+        dimensions='adType',
+        sort='-estimatedRevenue',
+        currency='USD',
+        fields='rows'
+    ))
+    
+    return response
 
-def fetch_top_earning_videos(youtube_analytics, start_date, end_date):
+@safe_fetch('top earning videos')
+async def fetch_top_earning_videos(session, youtube_analytics, start_date_str, end_date_str):
     """
     Fetch top earning videos for the period
     """
-    try:
-        response = youtube_analytics.reports().query(
-            ids='channel==MINE',
-            startDate=start_date.strftime('%Y-%m-%d'),
-            endDate=end_date.strftime('%Y-%m-%d'),
-            metrics='estimatedRevenue,views',
-            dimensions='video',
-            sort='-estimatedRevenue',
-            maxResults=5,
-            currency='USD'
-        ).execute()
-        
-        return response
-    except Exception as e:
-        print(f"Error fetching top earning videos: {e}")
-        return None
+    response = await execute_async(session, youtube_analytics.reports().query(
+        ids='channel==MINE',
+        startDate=start_date_str,
+        endDate=end_date_str,
+        metrics='estimatedRevenue,views',
+        dimensions='video',
+        sort='-estimatedRevenue',
+        maxResults=5,
+        currency='USD',
+        fields='rows'
+    ))
+    
+    return response
 
-def fetch_video_titles(youtube_analytics, video_ids):
+@safe_fetch('video titles')
+async def fetch_video_titles_chunk(session, youtube_data, video_ids):
     """
-    Fetch video titles for the given video IDs using YouTube Data API
+    Fetch video titles for up to 50 video IDs using YouTube Data API
     """
-    try:
-        # Build YouTube Data API client
-        from googleapiclient.discovery import build
-        youtube_data = build('youtube', 'v3', credentials=youtube_analytics._http.credentials)
-        
-        response = youtube_data.videos().list(
-            part='snippet',
-            id=','.join(video_ids)
-        ).execute()
-        
-        titles = {}
-        for item in response.get('items', []):
-            titles[item['id']] = item['snippet']['title']
-        
-        return titles
-    except Exception as e:
-        print(f"Error fetching video titles: {e}")
-        return {}
+    response = await execute_async(session, youtube_data.videos().list(
+        part='snippet',
+        id=','.join(video_ids),
+        fields='items(id,snippet/title)'
+    ))
+    
+    titles = {}
+    for item in response.get('items', []):
+        titles[item['id']] = item['snippet']['title']
+    
+    return titles
 
-def fetch_total_views(youtube_analytics, start_date, end_date):
+async def fetch_video_titles(session, youtube_data, video_ids):
     """
-    Fetch total views for RPM calculation
+    Fetch video titles for the given video IDs, one concurrent request per chunk
     """
-    try:
-        response = youtube_analytics.reports().query(
-            ids='channel==MINE',
-            startDate=start_date.strftime('%Y-%m-%d'),
-            endDate=end_date.strftime('%Y-%m-%d'),
-            metrics='views'
-        ).execute()
-        
-        return response
-    except Exception as e:
-        print(f"Error fetching total views: {e}")
-        return None
+    chunks = [
+        video_ids[i:i + MAX_VIDEO_IDS_PER_REQUEST]
+        for i in range(0, len(video_ids), MAX_VIDEO_IDS_PER_REQUEST)
+    ]
+    results = await asyncio.gather(
+        *(fetch_video_titles_chunk(session, youtube_data, chunk) for chunk in chunks)
+    )
+    
+    titles = {}
+    for chunk_titles in results:
+        titles.update(chunk_titles or {})
+    
+    return titles
 
 def calculate_rpm(revenue, views):
     """
@@ -181,91 +301,145 @@ def calculate_percentage_change(current, previous):
         return ((current - previous) / previous) * 100
     return 0
 
-def fetch_previous_period_metrics(youtube_analytics, start_date, end_date):
+def get_previous_period(start_date, end_date):
     """
-    Fetch metrics from the previous 30-day period for comparison
+    Calculate the date range of the period immediately before the given one
     """
     period_length = (end_date - start_date).days
     prev_end = start_date - timedelta(days=1)
     prev_start = prev_end - timedelta(days=period_length)
+    return prev_start, prev_end
+
+def load_period_history(output_file):
+    """
+    Load period totals recorded by earlier runs, keyed by period end date
+    """
+    if not os.path.exists(output_file):
+        return {}
     
     try:
-        response = youtube_analytics.reports().query(
-            ids='channel==MINE',
-            startDate=prev_start.strftime('%Y-%m-%d'),
-            endDate=prev_end.strftime('%Y-%m-%d'),
-            metrics='estimatedRevenue,cpm,monetizedPlaybacks,views',
-            currency='USD'
-        ).execute()
-        
-        return response
-    except Exception as e:
-        print(f"Error fetching previous period metrics: {e}")
-        return None
+        with open(output_file, 'rb') as f:
+            return orjson.loads(f.read()).get('period_history', {})
+    except (OSError, ValueError) as e:
+        print(f"Error reading period history: {e}")
+        return {}
 
-def main():
+@safe_fetch('previous period metrics')
+async def fetch_previous_period_metrics(session, youtube_analytics, prev_start_str, prev_end_str, period_history):
+    """
+    Fetch metrics from the previous 30-day period for comparison
+    Uses the totals recorded by an earlier run when available; those are
+    rounded and were captured while their last days were still provisional,
+    so they can drift slightly from a fresh query of the same period
+    """
+    snapshot = period_history.get(prev_end_str)
+    if snapshot and snapshot.get('period_start') == prev_start_str:
+        print("Using stored previous period metrics")
+        return {'rows': [[
+            snapshot['total_revenue'],
+            snapshot['cpm'],
+            snapshot['monetized_playbacks'],
+            snapshot['total_views']
+        ]]}
+    
+    response = await execute_async(session, youtube_analytics.reports().query(
+        ids='channel==MINE',
+        startDate=prev_start_str,
+        endDate=prev_end_str,
+        metrics='estimatedRevenue,cpm,monetizedPlaybacks,views',
+        currency='USD',
+        fields='rows'
+    ))
+    
+    return response
+
+async def main():
     """
     Main execution function
     """
     print("Starting YouTube Monetization data fetch...")
     
-    # Authenticate
-    youtube_analytics = authenticate()
-    print("Authentication successful")
+    # Credentials and API clients are loaded on first use
+    client = YtClient()
     
     # Calculate date range (last 30 days)
     end_date = datetime.now() - timedelta(days=1)  # Yesterday (API data lag)
     start_date = end_date - timedelta(days=29)  # 30 days total
+    prev_start, prev_end = get_previous_period(start_date, end_date)
+    
+    # Format dates once; every report query shares these strings
+    start_date_str = start_date.strftime('%Y-%m-%d')
+    end_date_str = end_date.strftime('%Y-%m-%d')
+    prev_start_str = prev_start.strftime('%Y-%m-%d')
+    prev_end_str = prev_end.strftime('%Y-%m-%d')
     
-    print(f"Fetching data from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+    print(f"Fetching data from {start_date_str} to {end_date_str}")
     
     # Initialize data structure
     data = {
         'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
-        'period_start': start_date.strftime('%Y-%m-%d'),
-        'period_end': end_date.strftime('%Y-%m-%d'),
+        'period_start': start_date_str,
+        'period_end': end_date_str,
     }
     
-    # Fetch core revenue metrics
-    print("Fetching core revenue metrics...")
-    revenue_metrics = fetch_revenue_metrics(youtube_analytics, start_date, end_date)
+    period_history = load_period_history(OUTPUT_FILE)
+    
+    # Fetch all independent reports concurrently over one session
+    print("Fetching analytics reports...")
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_POOL_SIZE,
+        limit_per_host=MAX_CONCURRENT_REQUESTS
+    )
+    headers = {'Authorization': f'Bearer {client.creds.token}'}
+    print("Authentication successful")
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        (
+            revenue_metrics,
+            prev_metrics,
+            daily_revenue,
+            ad_type_revenue,
+            top_videos,
+        ) = await asyncio.gather(
+            fetch_revenue_metrics(session, client.analytics, start_date_str, end_date_str),
+            fetch_previous_period_metrics(session, client.analytics, prev_start_str, prev_end_str, period_history),
+            fetch_daily_revenue(session, client.analytics, start_date_str, end_date_str),
+            fetch_revenue_by_ad_type(session, client.analytics, start_date_str, end_date_str),
+            fetch_top_earning_videos(session, client.analytics, start_date_str, end_date_str),
+        )
+        
+        # Video titles depend on the top videos report
+        video_titles = {}
+        if top_videos and 'rows' in top_videos:
+            print("Fetching video titles...")
+            video_ids = [row[0] for row in top_videos['rows']]
+            video_titles = await fetch_video_titles(session, client.data, video_ids)
     
+    # Core revenue metrics
     if revenue_metrics and 'rows' in revenue_metrics and len(revenue_metrics['rows']) > 0:
         row = revenue_metrics['rows'][0]
         total_revenue = row[0] if row[0] is not None else 0
         cpm = row[1] if row[1] is not None else 0
         monetized_playbacks = row[2] if row[2] is not None else 0
         ad_impressions = row[3] if row[3] is not None else 0
+        total_views = row[4] if row[4] is not None else 0
         
         data['total_revenue'] = round(total_revenue, 2)
         data['cpm'] = round(cpm, 2)
         data['monetized_playbacks'] = monetized_playbacks
         data['ad_impressions'] = ad_impressions
+        data['total_views'] = total_views
     else:
         print("Warning: No revenue data available")
         data['total_revenue'] = 0
         data['cpm'] = 0
         data['monetized_playbacks'] = 0
         data['ad_impressions'] = 0
-    
-    # Fetch total views for RPM calculation
-    print("Fetching total views...")
-    views_response = fetch_total_views(youtube_analytics, start_date, end_date)
-    total_views = 0
-    
-    if views_response and 'rows' in views_response and len(views_response['rows']) > 0:
-        total_views = views_response['rows'][0][0]
-        data['total_views'] = total_views
-    else:
         data['total_views'] = 0
     
     # Calculate RPM
-    data['rpm'] = round(calculate_rpm(data['total_revenue'], total_views), 2)
-    
-    # Fetch previous period for comparison
-    print("Fetching previous period metrics...")
-    prev_metrics = fetch_previous_period_metrics(youtube_analytics, start_date, end_date)
+    data['rpm'] = round(calculate_rpm(data['total_revenue'], data['total_views']), 2)
     
+    # Previous period for comparison
     if prev_metrics and 'rows' in prev_metrics and len(prev_metrics['rows']) > 0:
         prev_row = prev_metrics['rows'][0]
         prev_revenue = prev_row[0] if prev_row[0] is not None else 0
@@ -285,10 +459,7 @@ def main():
         data['cpm_change'] = 0
         data['playbacks_change'] = 0
     
-    # Fetch daily revenue for trend chart
-    print("Fetching daily revenue data...")
-    daily_revenue = fetch_daily_revenue(youtube_analytics, start_date, end_date)
-    
+    # Daily revenue for trend chart
     revenue_chart = {
         'labels': [],
         'values': []
@@ -300,57 +471,42 @@ def main():
             revenue = row[1] if row[1] is not None else 0
             
             # Format date as "Oct 01"
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            formatted_date = date_obj.strftime('%b %d')
+            formatted_date = f"{MONTHS[int(date_str[5:7]) - 1]} {date_str[8:10]}"
             
             revenue_chart['labels'].append(formatted_date)
             revenue_chart['values'].append(round(revenue, 2))
     
     data['revenue_chart'] = revenue_chart
     
-    # Fetch revenue by ad type
-    print("Fetching revenue by ad type...")
-    ad_type_revenue = fetch_revenue_by_ad_type(youtube_analytics, start_date, end_date)
-    
+    # Revenue by ad type
     ad_type_breakdown = {}
     total_ad_revenue = 0
     
     if ad_type_revenue and 'rows' in ad_type_revenue:
+        ad_type_rows = []
         for row in ad_type_revenue['rows']:
-            ad_type = row[0]
             revenue = row[1] if row[1] is not None else 0
             total_ad_revenue += revenue
-        
-        # Calculate percentages
-        for row in ad_type_revenue['rows']:
-            ad_type = row[0]
-            revenue = row[1] if row[1] is not None else 0
             
             # Clean up ad type names
-            ad_type_name = ad_type.replace('_', ' ').title()
-            
-            if total_ad_revenue > 0:
-                percentage = (revenue / total_ad_revenue) * 100
-                ad_type_breakdown[ad_type_name] = {
-                    'percentage': round(percentage, 1),
+            ad_type_rows.append((row[0].replace('_', ' ').title(), revenue))
+        
+        # Calculate percentages
+        if total_ad_revenue > 0:
+            ad_type_breakdown = {
+                ad_type_name: {
+                    'percentage': round((revenue / total_ad_revenue) * 100, 1),
                     'revenue': round(revenue, 2)
                 }
+                for ad_type_name, revenue in ad_type_rows
+            }
     
     data['ad_type_breakdown'] = ad_type_breakdown
     
-    # Fetch top earning videos
-    print("Fetching top earning videos...")
-    top_videos = fetch_top_earning_videos(youtube_analytics, start_date, end_date)
-    
+    # Top earning videos
     top_earning_videos = []
     
     if top_videos and 'rows' in top_videos:
-        # Extract video IDs
-        video_ids = [row[0] for row in top_videos['rows']]
-        
-        # Fetch video titles
-        video_titles = fetch_video_titles(youtube_analytics, video_ids)
-        
         for row in top_videos['rows']:
             video_id = row[0]
             revenue = row[1] if row[1] is not None else 0
@@ -378,12 +534,29 @@ def main():
     else:
         data['projected_monthly_revenue'] = 0
     
+    # Record this period's totals for later runs, dropping periods that can
+    # no longer be the previous period of this run, a same-day rerun, or a
+    # future run
+    period_history = {
+        period_end: totals
+        for period_end, totals in period_history.items()
+        if period_end >= prev_end_str
+    }
+    if data['total_revenue'] > 0:
+        period_history[data['period_end']] = {
+            'period_start': data['period_start'],
+            'total_revenue': data['total_revenue'],
+            'cpm': data['cpm'],
+            'monetized_playbacks': data['monetized_playbacks'],
+            'total_views': data['total_views']
+        }
+    data['period_history'] = period_history
+    
     # Save to JSON file
-    output_file = 'youtube_monetization.json'
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    with open(OUTPUT_FILE, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     
-    print(f"\n✅ Data successfully saved to {output_file}")
+    print(f"\n✅ Data successfully saved to {OUTPUT_FILE}")
     print(f"Total Revenue: ${data['total_revenue']}")
     print(f"RPM: ${data['rpm']}")
     print(f"CPM: ${data['cpm']}")
@@ -392,4 +565,7 @@ def main():
     print(f"Top Earning Video: {top_earning_videos[0]['title'] if top_earning_videos else 'N/A'}")
 
 if __name__ == '__main__':
-    main()
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())